@@ -1,19 +1,28 @@
 import os
 import argparse
 import json
+import atexit
+import hmac
 import asyncio
+import time
+import random
 import logging
 import logging.config
 from datetime import datetime, timedelta, timezone
-from threading import RLock
 from contextlib import asynccontextmanager
 
+import anyio
 import httpx
+import aiorwlock
 import uvicorn
 from uvicorn.config import LOGGING_CONFIG
 from fastapi import FastAPI, Request, HTTPException, Depends, Header, APIRouter
-from fastapi.responses import StreamingResponse
-from apscheduler.schedulers.background import BackgroundScheduler
+from fastapi.responses import Response
+
+try:
+    import orjson
+except ImportError:  # Fallback to stdlib json
+    orjson = None
 
 # Configurations
 CONFIG_FILE = "svbridge-config.json"
@@ -30,6 +39,8 @@ DEFAULT_CONFIG: dict[str, str | bool | int | None] = {
 LOCATION = "us-central1"
 PROJECT_ID = None  # to be set on startup
 ENDPOINT_ID = "openapi"
+CHAT_COMPLETIONS_URL = ""  # to be set on startup
+MODELS_URL_TEMPLATE = ""  # to be set on startup, formatted with publisher
 PUBLISHERS = (
     "google",
     "anthropic",
@@ -43,6 +54,24 @@ MODEL_NAMES_FILTER = (
 
 TOKEN_EXPIRY_BUFFER = timedelta(minutes=10)
 BACKGROUND_INTERVAL = 5  # minutes
+CONFIG_FLUSH_INTERVAL = 30  # seconds
+MODELS_CACHE_TTL = 600  # seconds
+MODELS_FETCH_TIMEOUT = 10.0  # seconds, per publisher request
+_PASS_RESPONSE_HEADERS = frozenset({b"content-type", b"content-encoding"})
+# The ASGI spec requires servers to lowercase header names in scope["headers"]
+_SKIP_HEADERS = frozenset({b"host", b"authorization", b"transfer-encoding"})
+
+HTTP_TIMEOUTS = {
+    "connect": 10.0,
+    "read": None,  # streaming responses can be slow, never cut them off
+    "write": None,
+    "pool": 10.0,
+}
+HTTP_LIMITS = {
+    "max_keepalive_connections": 50,
+    "max_connections": 200,
+    "keepalive_expiry": 60.0,  # seconds, keep warm TLS sessions to Vertex
+}
 
 
 @asynccontextmanager
@@ -55,48 +84,81 @@ async def lifespan(app: FastAPI):
 
 app = FastAPI(lifespan=lifespan)
 router = APIRouter()
-token_lock = RLock()
+token_lock = aiorwlock.RWLock(fast=True)
 config: dict[str, str | bool | int | None] = {}
 logging.config.dictConfig(LOGGING_CONFIG)
 logger: logging.Logger = logging.getLogger("uvicorn")
 http_client: httpx.AsyncClient | None = None  # Reusable httpx client
+_auth_key: bytes = b""  # API key from config, set on load
+_token_cache: str | None = None  # Parsed from config, reset on load
+_expiry_cache: datetime | None = None
+_config_dirty = False  # Set when config changed in memory but not yet on disk
+_refresh_task: asyncio.Task | None = None  # Token fetch in flight, if any
+_models_cache: tuple[float, dict] | None = None  # (monotonic time, response)
+models_lock = asyncio.Lock()  # Coalesce concurrent /models cache misses
+
+
+def json_loads(data: bytes):
+    """Parse json, with orjson if available"""
+    return orjson.loads(data) if orjson else json.loads(data)
+
+
+def json_dumps(obj) -> bytes:
+    """Serialize json with indentation, with orjson if available"""
+    if orjson:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode()
 
 
 def load_config():
-    """Load or initialize the config file"""
-    global config
-    with token_lock:
-        is_changed = True
-        if os.path.exists(CONFIG_FILE):
-            try:
-                with open(CONFIG_FILE, "r") as f:
-                    json_data = json.load(f)
-                    config.update(json_data)
-                    if config == json_data:
-                        is_changed = False
-                logger.info(f'[Config] Loaded <== "{CONFIG_FILE}"')
-            except json.JSONDecodeError as e:
-                logger.error(f"[Config] Failed to load config and using defaults: {e}")
-                config = DEFAULT_CONFIG.copy()
-        else:
-            logger.warning(f"[Config] No config file found, using defaults")
+    """Load or initialize the config file (before serving, no locking needed)"""
+    global config, _auth_key
+    is_changed = True
+    if os.path.exists(CONFIG_FILE):
+        try:
+            with open(CONFIG_FILE, "rb") as f:
+                json_data = json_loads(f.read())
+                config.update(json_data)
+                if config == json_data:
+                    is_changed = False
+            logger.info(f'[Config] Loaded <== "{CONFIG_FILE}"')
+        except json.JSONDecodeError as e:
+            logger.error(f"[Config] Failed to load config and using defaults: {e}")
             config = DEFAULT_CONFIG.copy()
-        for k, v in DEFAULT_CONFIG.items():
-            config.setdefault(k, v)
-
-        if is_changed:
-            save_config()
+    else:
+        logger.warning(f"[Config] No config file found, using defaults")
+        config = DEFAULT_CONFIG.copy()
+    for k, v in DEFAULT_CONFIG.items():
+        config.setdefault(k, v)
+    _auth_key = str(config.get("key") or "").encode()
+    _load_token_cache()
+
+    if is_changed:
+        save_config()
 
 
 def save_config():
-    """Save config file"""
-    with token_lock:
-        try:
-            with open(CONFIG_FILE, "w") as f:
-                json.dump(config, f, indent=4)
-            logger.info(f'[Config] Saved ==> "{CONFIG_FILE}"')
-        except Exception as e:
-            logger.error(f"[Config] Failed to save config: {e}")
+    """Save config file atomically (blocking, keep it off the event loop)"""
+    data = config.copy()
+    tmp_file = f"{CONFIG_FILE}.tmp"
+    try:
+        with open(tmp_file, "wb") as f:
+            f.write(json_dumps(data))
+        os.replace(tmp_file, CONFIG_FILE)
+        logger.info(f'[Config] Saved ==> "{CONFIG_FILE}"')
+    except Exception as e:
+        logger.error(f"[Config] Failed to save config: {e}")
+
+
+def _flush_config_if_dirty():
+    """Write config to disk if it changed since the last flush"""
+    global _config_dirty
+    if _config_dirty:
+        _config_dirty = False
+        save_config()
+
+
+atexit.register(_flush_config_if_dirty)
 
 
 def get_gcloud_project_id() -> str:
@@ -127,64 +189,115 @@ def generate_gcloud_token() -> tuple[str, datetime] | tuple[None, None]:
         return None, None
 
 
-def is_valid() -> bool:
-    """Check whether the local token exists and is not expired (with buffer)"""
-    with token_lock:
-        token = config.get("access_token")
-        exp = config.get("token_expiry")
+def _load_token_cache() -> None:
+    """Parse token and expiry from config, called by load_config before serving"""
+    global _token_cache, _expiry_cache
+    _token_cache = _expiry_cache = None
+    token = config.get("access_token")
+    exp = config.get("token_expiry")
     if not token or not exp:
-        logger.info("[Token] Token invalid: missing token or expiry")
-        return False
+        return
     try:
         assert isinstance(token, str)
         assert isinstance(exp, str)
         expiry = datetime.fromisoformat(exp)
-        if expiry.tzinfo is None:
-            expiry = expiry.replace(tzinfo=timezone.utc)
-        now = datetime.now(timezone.utc)
-        if now < (expiry - TOKEN_EXPIRY_BUFFER):
-            logger.info(f"[Token] Token valid until {expiry}")
-            return True
-        logger.info(f"[Token] Token expired at {expiry}")
-        return False
     except ValueError as e:
         logger.error(f"[Token] Invalid expiry format: {e}")
+        return
+    if expiry.tzinfo is None:
+        expiry = expiry.replace(tzinfo=timezone.utc)
+    _token_cache, _expiry_cache = token, expiry
+
+
+def _is_valid() -> bool:
+    """Check token validity, caller must hold token_lock"""
+    if _expiry_cache is None:
+        logger.info("[Token] Token invalid: missing token or expiry")
         return False
+    if datetime.now(timezone.utc) < (_expiry_cache - TOKEN_EXPIRY_BUFFER):
+        logger.debug("[Token] Token valid until %s", _expiry_cache)
+        return True
+    logger.info(f"[Token] Token expired at {_expiry_cache}")
+    return False
+
+
+def should_proactively_refresh() -> bool:
+    """Whether token may expire before next check, caller must hold token_lock"""
+    if _expiry_cache is None:
+        return True
+    remaining = _expiry_cache - datetime.now(timezone.utc)
+    return remaining < timedelta(minutes=BACKGROUND_INTERVAL * 2) + TOKEN_EXPIRY_BUFFER
 
 
-def refresh_token(force=False):
-    """Refresh token"""
-    with token_lock:
-        if force or not is_valid():
-            new_token, new_exp = generate_gcloud_token()
-            if new_token and new_exp:
-                config["access_token"] = new_token
-                config["token_expiry"] = new_exp.isoformat()
-                save_config()
-                logger.info("[Token] Token refreshed")
+async def _fetch_token() -> bool:
+    """Fetch a new token without holding the lock, then swap it in"""
+    global _token_cache, _expiry_cache, _config_dirty
+    new_token, new_exp = await asyncio.to_thread(generate_gcloud_token)
+    if not new_token or not new_exp:
+        logger.error("[Token] Token refresh failed")
+        return False
+    async with token_lock.writer_lock:
+        config["access_token"] = new_token
+        config["token_expiry"] = new_exp.isoformat()
+        _token_cache, _expiry_cache = new_token, new_exp
+        _config_dirty = True  # Persisted later by the flush job
+    logger.info("[Token] Token refreshed")
+    return True
+
+
+def _start_refresh() -> asyncio.Task:
+    """Start a token fetch, or join the one already in flight"""
+    global _refresh_task
+    if _refresh_task is None or _refresh_task.done():
+        _refresh_task = asyncio.create_task(_fetch_token())
+    return _refresh_task
+
+
+async def refresh_token(force=False):
+    """Refresh token, readers keep using the old one until the new one is in"""
+    if not force:
+        async with token_lock.reader_lock:
+            if _is_valid():
+                logger.info("[Token] No refresh needed")
                 return True
-            logger.error("[Token] Token refresh failed")
-            return False
+    # Shielded so a cancelled request doesnt cancel a fetch others are waiting on
+    return await asyncio.shield(_start_refresh())
+
+
+async def background_refresh():
+    """Refresh ahead of time so requests never wait for a new token"""
+    async with token_lock.reader_lock:
+        needed = should_proactively_refresh()
+    if needed:
+        await refresh_token(force=True)
+    else:
         logger.info("[Token] No refresh needed")
-        return True
 
 
-def get_token():
-    """Get current token, refresh when expired"""
-    with token_lock:
-        if not is_valid():
-            logger.warning("[Token] Token expired, forcing refresh")
-            if not refresh_token(force=True):
-                logger.error("[Token] Failed to get token")
-                return None
-        logger.info("[Token] Token retrieved successfully")
-        return config.get("access_token")
+async def get_token():
+    """Get current token, refresh inline only when background refresh is off"""
+    async with token_lock.reader_lock:
+        if _is_valid():
+            logger.debug("[Token] Token retrieved successfully")
+            return _token_cache
+    if config.get("auto_refresh"):
+        # Background refresh should have kept it valid, dont block the request
+        logger.warning("[Token] Token expired, scheduling refresh")
+        _start_refresh()
+        return None
+    # Concurrent callers share a single fetch
+    logger.warning("[Token] Token expired, refreshing")
+    if not await refresh_token():
+        logger.error("[Token] Failed to get token")
+        return None
+    async with token_lock.reader_lock:
+        logger.debug("[Token] Token retrieved successfully")
+        return _token_cache
 
 
 async def verify_token(authorization: str | None = Header(None)):
     """Verify the Bearer token if key is set"""
-    auth_key = config.get("key")
-    if auth_key:  # Only check if key is set
+    if _auth_key:  # Only check if key is set
         if not authorization:
             logger.warning("[Auth] Missing Authorization header")
             raise HTTPException(status_code=401, detail="Missing Authorization header")
@@ -199,10 +312,10 @@ async def verify_token(authorization: str | None = Header(None)):
             )
 
         token = parts[1]
-        if token != auth_key:
+        if not hmac.compare_digest(token.encode(), _auth_key):
             logger.warning("[Auth] Invalid token")
             raise HTTPException(status_code=401, detail="Invalid token")
-        logger.info("[Auth] Token verified successfully")
+        logger.debug("[Auth] Token verified successfully")
 
 
 @app.get("/")
@@ -210,6 +323,56 @@ async def root():
     return "Hello, this is Simple Vertex Bridge! UwU"
 
 
+class _RawProxyResponse(Response):
+    """Sends the upstream stream straight through ASGI, closes it when done"""
+
+    background = None  # FastAPI reads this on returned responses, never set here
+
+    def __init__(self, resp: httpx.Response, stream_ctx):
+        self.resp = resp
+        self.stream_ctx = stream_ctx
+        self.status_code = resp.status_code
+        # Body is passed through undecoded, so keep its content-encoding
+        self.raw_headers = [
+            (key.lower(), value)
+            for key, value in resp.headers.raw
+            if key.lower() in _PASS_RESPONSE_HEADERS
+        ]
+
+    async def stream_body(self, send):
+        await send(
+            {
+                "type": "http.response.start",
+                "status": self.status_code,
+                "headers": self.raw_headers,
+            }
+        )
+        async for chunk in self.resp.aiter_raw():
+            await send({"type": "http.response.body", "body": chunk, "more_body": True})
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+    async def listen_for_disconnect(self, receive):
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                break
+
+    async def __call__(self, scope, receive, send):
+        # Servers may silently drop sends after a disconnect, so watch for it
+        # and stop reading upstream instead of paying for the whole generation
+        try:
+            async with anyio.create_task_group() as task_group:
+
+                async def wrap(func):
+                    await func()
+                    task_group.cancel_scope.cancel()
+
+                task_group.start_soon(wrap, lambda: self.stream_body(send))
+                await wrap(lambda: self.listen_for_disconnect(receive))
+        finally:
+            await self.stream_ctx.__aexit__(None, None, None)
+
+
 @router.api_route(
     "/chat/completions",
     methods=["GET", "POST"],
@@ -217,131 +380,149 @@ async def root():
 )
 async def chat_completions(request: Request):
     """Proxy to Vertex AI with Bearer token"""
-    logger.info(f"[Proxy] Received request: {request.url.path}")
-    token = get_token()
+    logger.debug("[Proxy] Received request: %s", request.url.path)
+    token = await get_token()
     if not token:
         logger.error("[Proxy] No valid token for proxy request")
-        raise HTTPException(status_code=500, detail="Failed to obtain token")
+        raise HTTPException(status_code=503, detail="Failed to obtain token")
 
-    target = (
-        f"https://{LOCATION}-aiplatform.googleapis.com/v1"
-        f"/projects/{PROJECT_ID}"
-        f"/locations/{LOCATION}"
-        f"/endpoints/{ENDPOINT_ID}"
-        f"/chat/completions"
-    )
-    if request.url.query:
-        target += f"?{request.url.query}"
-    logger.info(f"[Proxy] {request.method} {target}")
+    query = request.url.query
+    target = CHAT_COMPLETIONS_URL + ("?" + query if query else "")
+    logger.debug("[Proxy] %s %s", request.method, target)
 
     headers = {
-        key: value
-        for key, value in request.headers.items()
-        if key.lower() not in ("host", "authorization", "content-length")
+        key.decode("latin-1"): value.decode("latin-1")
+        for key, value in request.headers.raw
+        if key not in _SKIP_HEADERS
     }
     headers["Authorization"] = f"Bearer {token}"
+    # Body is passed through undecoded, dont let httpx ask for gzip on its own
+    headers.setdefault("accept-encoding", "identity")
 
-    body = await request.body()
-
-    async def stream_with_header():
-        assert http_client
-        async with http_client.stream(
-            request.method,
-            target,
-            headers=headers,
-            content=body,
-        ) as resp:
-            yield resp.status_code, resp.headers.get("content-type")
-
-            async for chunk in resp.aiter_bytes():
-                yield chunk
-
-    ait = stream_with_header()
-    status_code, media_type = await ait.__anext__()
-    assert isinstance(status_code, int)
-    assert isinstance(media_type, str)
-
-    async def stream_wrapper():
-        async for chunk in ait:
-            assert isinstance(chunk, bytes)
-            yield chunk
-
-    return StreamingResponse(
-        stream_wrapper(),
-        status_code=status_code,
-        media_type=media_type,
+    assert http_client
+    # Enter the stream by hand so status and headers are known up front,
+    # the response closes it once the body has been sent
+    stream_ctx = http_client.stream(
+        request.method,
+        target,
+        headers=headers,
+        # Forward the body as it arrives, GET carries none
+        content=request.stream() if request.method == "POST" else None,
     )
+    resp = await stream_ctx.__aenter__()
+    return _RawProxyResponse(resp, stream_ctx)
+
+
+def get_cached_models() -> dict | None:
+    """Return the cached models response if it has not expired"""
+    if _models_cache and time.monotonic() - _models_cache[0] < MODELS_CACHE_TTL:
+        return _models_cache[1]
+    return None
 
 
 @router.api_route("/models", methods=["GET"], dependencies=[Depends(verify_token)])
 async def models(request: Request):
-    """Fetches available models from Vertex and returns them in OpenAI format"""
+    """Returns available Vertex models in OpenAI format, cached for a while"""
+    global _models_cache
+    logger.debug("[Models] Received request: %s", request.url.path)
+    if (cached := get_cached_models()) is not None:
+        logger.debug("[Models] Using cached models")
+        return cached
+
+    async with models_lock:
+        # Another request may have filled the cache while we were waiting
+        if (cached := get_cached_models()) is not None:
+            logger.debug("[Models] Using cached models")
+            return cached
+
+        token = await get_token()
+        if not token:
+            logger.error("[Models] No valid token for models request")
+            raise HTTPException(status_code=503, detail="Failed to obtain token")
+
+        result, complete = await fetch_models(token)
+        if complete:  # Dont keep a partial list around
+            _models_cache = (time.monotonic(), result)
+        return result
+
+
+async def fetch_models(token: str) -> tuple[dict, bool]:
+    """Fetches models from Vertex, returns the response and whether all succeeded"""
     assert PROJECT_ID
-    logger.info(f"[Models] Received request: {request.url.path}")
-    token = get_token()
-    if not token:
-        logger.error("[Models] No valid token for models request")
-        raise HTTPException(status_code=500, detail="Failed to obtain token")
-
     # Get all publishers asynchronously
     logger.info(f"[Models] Fetching models from {len(PUBLISHERS)} publishers...")
 
     async def retry_request(session, publisher, url, headers, max_retries=3):
         for attempt in range(max_retries):
             try:
-                response = await session.get(url, headers=headers)
+                response = await session.get(
+                    url, headers=headers, timeout=MODELS_FETCH_TIMEOUT
+                )
                 logger.info(f"[Models] {response.status_code} {publisher}")
                 return response
-            except httpx.RequestError as e:
+            except httpx.RequestError as e:  # Includes httpx timeouts
                 if attempt < max_retries - 1:
+                    # Exponential backoff with jitter, 200/400/800ms...
+                    delay = 0.2 * (2**attempt) + random.uniform(0, 0.1)
                     logger.warning(
-                        f'[Models] Failed to fetch models for publisher "{publisher}", will retry in 200ms: {type(e).__name__}'
+                        f'[Models] Failed to fetch models for publisher "{publisher}", will retry in {delay * 1000:.0f}ms: {type(e).__name__}'
                         + (f", {e}" if str(e) else "")
                     )
-                    await asyncio.sleep(0.2)
+                    await asyncio.sleep(delay)
                     continue
                 return e
+            except Exception as e:
+                # Not retryable, but dont let it cancel the other publishers
+                return e
 
     assert http_client
-    tasks = [
-        retry_request(
-            http_client,
-            publisher,
-            f"https://{LOCATION}-aiplatform.googleapis.com/v1beta1/publishers/{publisher}/models",
-            headers={
-                "Content-Type": "application/json",
-                "Authorization": f"Bearer {token}",
-                "x-goog-user-project": PROJECT_ID,
-            },
-        )
-        for publisher in PUBLISHERS
-    ]
-    responses = await asyncio.gather(*tasks, return_exceptions=True)
+    async with asyncio.TaskGroup() as tg:
+        tasks = [
+            tg.create_task(
+                retry_request(
+                    http_client,
+                    publisher,
+                    MODELS_URL_TEMPLATE.format(publisher=publisher),
+                    headers={
+                        "Content-Type": "application/json",
+                        "Authorization": f"Bearer {token}",
+                        "x-goog-user-project": PROJECT_ID,
+                    },
+                )
+            )
+            for publisher in PUBLISHERS
+        ]
+    responses = [task.result() for task in tasks]
 
     # Convert to OpenAI format
     all_models = []
+    complete = True
     for publisher, resp in zip(PUBLISHERS, responses):
         if isinstance(resp, Exception):
             logger.warning(
                 f'[Models] Failed to fetch models for publisher "{publisher}": {type(resp).__name__}'
                 + (f", {resp}" if str(resp) else "")
             )
+            complete = False
             continue
         assert isinstance(resp, httpx.Response)
         if resp.status_code == 200:
-            data = resp.json()
+            data = json_loads(resp.content)
             publisher_models = data.get("publisherModels", [])
             for model in publisher_models:
                 name = model.get("name")
-                if name:
-                    parts = name.split("/")
+                # Expecting "publishers/{publisher}/models/{model}"
+                if name and name.startswith("publishers/"):
+                    model_publisher, sep, model_name = name.removeprefix(
+                        "publishers/"
+                    ).partition("/models/")
                     if (
-                        len(parts) == 4
-                        and parts[0] == "publishers"
-                        and parts[2] == "models"
+                        sep
+                        and model_publisher
+                        and model_name
+                        and "/" not in model_publisher
+                        and "/" not in model_name
                     ):
-                        model_publisher = parts[1]
-                        model_name = parts[3]
                         model_id = f"{model_publisher}/{model_name}"
                         all_models.append(
                             {
@@ -354,20 +535,19 @@ async def models(request: Request):
             logger.warning(
                 f'[Models] Failed to fetch models for publisher "{publisher}": {resp.status_code} {resp.text}.'
             )
+            complete = False
 
     # Prefix filter
     if config.get("filter_model_names", True):
         all_models_count = len(all_models)
         all_models = [
-            model
-            for model in all_models
-            if any(model["id"].startswith(prefix) for prefix in MODEL_NAMES_FILTER)
+            model for model in all_models if model["id"].startswith(MODEL_NAMES_FILTER)
         ]
         logger.info(f"[Models] Fetched {len(all_models)}/{all_models_count} models")
     else:
         logger.info(f"[Models] Fetched {len(all_models)} models")
 
-    return {"object": "list", "data": all_models}
+    return {"object": "list", "data": all_models}, complete
 
 
 app.include_router(router)
@@ -378,7 +558,11 @@ async def startup_event():
     """Startup event"""
     global http_client
     logger.info("[HTTPClient] Creating reusable client...")
-    http_client = httpx.AsyncClient(http2=True, timeout=None)
+    http_client = httpx.AsyncClient(
+        http2=True,
+        timeout=httpx.Timeout(**HTTP_TIMEOUTS),
+        limits=httpx.Limits(**HTTP_LIMITS),
+    )
     logger.info("[HTTPClient] Created reusable client")
 
     global PROJECT_ID
@@ -386,24 +570,59 @@ async def startup_event():
     PROJECT_ID = get_gcloud_project_id()
     logger.info(f"[Google] Project ID: {PROJECT_ID}")
 
+    global CHAT_COMPLETIONS_URL, MODELS_URL_TEMPLATE
+    CHAT_COMPLETIONS_URL = (
+        f"https://{LOCATION}-aiplatform.googleapis.com/v1"
+        f"/projects/{PROJECT_ID}"
+        f"/locations/{LOCATION}"
+        f"/endpoints/{ENDPOINT_ID}"
+        f"/chat/completions"
+    )
+    MODELS_URL_TEMPLATE = (
+        f"https://{LOCATION}-aiplatform.googleapis.com/v1beta1"
+        "/publishers/{publisher}/models"
+    )
+
     load_config()
+    app.state.background_tasks = [asyncio.create_task(_flush_loop())]
     if config.get("auto_refresh"):
         logger.info(
             f"[Background] Started checking token every {BACKGROUND_INTERVAL} minutes"
         )
-        scheduler = BackgroundScheduler()
-        scheduler.add_job(refresh_token, "interval", minutes=BACKGROUND_INTERVAL)
-        scheduler.start()
-        refresh_token()  # Run once immediately
+        await background_refresh()  # Run once immediately
+        app.state.background_tasks.append(asyncio.create_task(_refresh_loop()))
+
+
+async def _refresh_loop():
+    """Check the token every BACKGROUND_INTERVAL minutes"""
+    while True:
+        await asyncio.sleep(BACKGROUND_INTERVAL * 60)
+        try:
+            await background_refresh()
+        except Exception as e:
+            logger.error(f"[Background] Token refresh check failed: {e}")
+
+
+async def _flush_loop():
+    """Write pending config changes every CONFIG_FLUSH_INTERVAL seconds"""
+    while True:
+        await asyncio.sleep(CONFIG_FLUSH_INTERVAL)
+        await asyncio.to_thread(_flush_config_if_dirty)
 
 
 async def shutdown_event():
     """Shutdown event"""
     global http_client
+    tasks = getattr(app.state, "background_tasks", [])
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
     if http_client:
         await http_client.aclose()
         logger.info("[HTTPClient] Closed reusable client")
         http_client = None
+    _flush_config_if_dirty()
 
 
 def main():
@@ -478,7 +697,8 @@ def main():
     elif key:
         logger.info(f'API key: "{key}"')
     logger.info(f"--------")
-    uvicorn.run("svbridge:app", host=bind, port=port)
+    # "auto" picks uvloop and httptools when installed (no uvloop on Windows)
+    uvicorn.run("svbridge:app", host=bind, port=port, loop="auto", http="auto")
 
 
 if __name__ == "__main__":